@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+# Anomaly detection: expected cnt per (dow, hr, weathersit) and rolling robust z-scores
+ANOMALY_KEYS = ['dow', 'hr', 'weathersit']
+SCORE_COLUMNS = ['instant', 'dteday', 'hr', 'weathersit', 'cnt']
+
+def data_fingerprint(data):
+    # Order-sensitive hash of the columns the scores depend on
+    hashes = pd.util.hash_pandas_object(data[SCORE_COLUMNS], index=False).to_numpy()
+    return hash((len(hashes), hashes.tobytes()))
+
+def update_anomaly_state(state, new_rows, window=168):
+    # Score only the new hours. Both the baseline and the rolling statistics are causal,
+    # so feeding the series in batches gives the same scores as a single full pass
+    new = new_rows[SCORE_COLUMNS].copy()
+    new['dow'] = new['dteday'].dt.dayofweek
+
+    if state is None:
+        baseline = None
+        history = pd.DataFrame(columns=['residual', 'rolling_median', 'deviation'], dtype=float)
+        scores = None
+    else:
+        baseline = state['baseline']
+        history = state['scores'][['residual', 'rolling_median', 'deviation']].iloc[-(window - 1):]
+        scores = state['scores']
+
+    # Expected cnt is the mean of earlier hours with the same key, excluding the hour itself
+    if baseline is None:
+        prior = pd.DataFrame({'sum': 0.0, 'count': 0.0}, index=new.index)
+    else:
+        prior = new.join(baseline, on=ANOMALY_KEYS)[['sum', 'count']].fillna(0)
+    grouped = new.groupby(ANOMALY_KEYS)['cnt']
+    prior_sum = prior['sum'] + grouped.cumsum() - new['cnt']
+    prior_count = prior['count'] + grouped.cumcount()
+    new['expected'] = (prior_sum / prior_count).where(prior_count > 0)
+    new['residual'] = new['cnt'] - new['expected']
+
+    batch = grouped.agg(['sum', 'count']).astype(float)
+    baseline = batch if baseline is None else baseline.add(batch, fill_value=0)
+
+    # Rolling median of residuals, then rolling median of absolute deviations from it (MAD)
+    residuals = pd.concat([history['residual'], new['residual']], ignore_index=True)
+    rolling_median = residuals.rolling(window, min_periods=1).median().iloc[len(history):]
+    new['rolling_median'] = rolling_median.to_numpy()
+    new['deviation'] = (new['residual'] - new['rolling_median']).abs()
+
+    deviations = pd.concat([history['deviation'], new['deviation']], ignore_index=True)
+    mad = deviations.rolling(window, min_periods=1).median().iloc[len(history):].to_numpy()
+
+    # 0.6745 scales the MAD to be comparable with a standard deviation
+    with np.errstate(divide='ignore', invalid='ignore'):
+        robust_z = 0.6745 * (new['residual'].to_numpy() - new['rolling_median'].to_numpy()) / mad
+    new['robust_z'] = np.where(mad > 0, robust_z, np.nan)
+
+    scores = new if scores is None else pd.concat([scores, new])
+    return {'baseline': baseline, 'scores': scores, 'window': window}
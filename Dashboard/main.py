@@ -7,6 +7,7 @@ import seaborn as sns
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from anomaly import data_fingerprint, update_anomaly_state
 
 # Set page configuration
 st.set_page_config(
@@ -80,6 +81,24 @@ def load_data():
 
 df = load_data()
 
+def get_anomaly_scores(data, window):
+    # Keep the state across reruns and only score hours that arrived since the last run;
+    # rescore everything if the already scored rows were corrected or reloaded
+    state = st.session_state.get('anomaly_state')
+    scored = 0 if state is None else len(state['scores'])
+    if (
+        state is None
+        or state['window'] != window
+        or len(data) < scored
+        or data_fingerprint(data.iloc[:scored]) != state['fingerprint']
+    ):
+        state = update_anomaly_state(None, data, window)
+    elif len(data) > scored:
+        state = update_anomaly_state(state, data.iloc[scored:], window)
+    state['fingerprint'] = data_fingerprint(data)
+    st.session_state['anomaly_state'] = state
+    return state['scores']
+
 # Load data
 df = load_data()
 
@@ -464,6 +483,8 @@ with tab2:
         [1, '#0D47A1']
     ]
     
+    day_names = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
     fig_heatmap = px.imshow(
         heatmap_pivot,
         color_continuous_scale=colorscale,
@@ -481,7 +502,7 @@ with tab2:
         yaxis=dict(
             tickmode='array',
             tickvals=[0, 1, 2, 3, 4, 5, 6],
-            ticktext=['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'],
+            ticktext=day_names,
             title='Day of Week'
         ),
         margin=dict(l=40, r=40, t=60, b=40),
@@ -489,9 +510,79 @@ with tab2:
     )
     
     fig_heatmap.update_traces(hoverongaps=False)
-    
+
+    # Anomaly detection controls
+    col1, col2 = st.columns(2)
+
+    with col1:
+        anomaly_window = st.select_slider(
+            "Rolling Window (hours)",
+            options=[24, 72, 168, 336, 720],
+            value=168
+        )
+
+    with col2:
+        anomaly_threshold = st.slider(
+            "Anomaly Threshold (|robust z|)",
+            min_value=2.0,
+            max_value=6.0,
+            value=3.5,
+            step=0.5
+        )
+
+    # Scores are computed over the full hourly series, then narrowed to the current filters
+    anomaly_scores = get_anomaly_scores(df, anomaly_window)
+    anomalies = anomaly_scores[
+        anomaly_scores.index.isin(filtered_df.index) & (anomaly_scores['robust_z'].abs() >= anomaly_threshold)
+    ]
+
+    # Highlight heatmap cells containing anomalous hours
+    anomaly_counts = anomalies.groupby(['dow', 'hr']).size().reset_index(name='anomalies')
+    fig_heatmap.add_trace(
+        go.Scatter(
+            x=anomaly_counts['hr'],
+            y=anomaly_counts['dow'],
+            mode='markers',
+            marker=dict(
+                symbol='x',
+                color='#F44336',
+                size=np.clip(6 + anomaly_counts['anomalies'] * 2, 6, 20)
+            ),
+            customdata=np.column_stack([
+                anomaly_counts['dow'].map(dict(enumerate(day_names))),
+                anomaly_counts['anomalies']
+            ]),
+            hovertemplate='Hour: %{x}<br>Day: %{customdata[0]}<br>Anomalies: %{customdata[1]}<extra></extra>',
+            name='Anomalies',
+            showlegend=False
+        )
+    )
+
     st.plotly_chart(fig_heatmap, use_container_width=True)
 
+    # Anomalous hours list
+    st.markdown("<h3 class='sub-header'>Anomalous Hours</h3>", unsafe_allow_html=True)
+
+    if anomalies.empty:
+        st.info("No anomalous hours found for the selected filters and threshold.")
+    else:
+        anomaly_table = anomalies.sort_values('robust_z', key=np.abs, ascending=False).copy()
+        anomaly_table['weathersit'] = anomaly_table['weathersit'].map(weather_mapping)
+        anomaly_table['expected'] = anomaly_table['expected'].round(1)
+        anomaly_table['robust_z'] = anomaly_table['robust_z'].round(2)
+        st.dataframe(
+            anomaly_table[['dteday', 'hr', 'weathersit', 'cnt', 'expected', 'robust_z']].rename(columns={
+                'dteday': 'Date',
+                'hr': 'Hour',
+                'weathersit': 'Weather',
+                'cnt': 'Rentals',
+                'expected': 'Expected',
+                'robust_z': 'Robust Z'
+            }),
+            use_container_width=True,
+            hide_index=True
+        )
+
 with tab3:
     st.markdown("<h2 class='sub-header'>Weather Impact Analysis</h2>", unsafe_allow_html=True)
     
@@ -0,0 +1,48 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'Dashboard'))
+
+from anomaly import data_fingerprint, update_anomaly_state
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), '..', 'Dashboard', 'all_data_cleaned.csv')
+
+
+def load_hourly():
+    return pd.read_csv(DATA_PATH, parse_dates=['dteday'])
+
+
+def test_incremental_matches_full_rescore():
+    df = load_hourly()
+    for window in (24, 720):
+        full = update_anomaly_state(None, df, window)
+
+        state = update_anomaly_state(None, df.iloc[:10000], window)
+        state = update_anomaly_state(state, df.iloc[10000:10001], window)
+        state = update_anomaly_state(state, df.iloc[10001:], window)
+
+        pd.testing.assert_frame_equal(state['scores'], full['scores'])
+        pd.testing.assert_frame_equal(state['baseline'], full['baseline'])
+
+
+def test_expected_excludes_current_hour():
+    df = load_hourly()
+    scores = update_anomaly_state(None, df)['scores']
+
+    # Expected is the mean of earlier hours in the same (dow, hr, weathersit) cell only
+    prior_mean = scores.groupby(['dow', 'hr', 'weathersit'])['cnt'].transform(
+        lambda cnt: cnt.shift().expanding().mean()
+    )
+    np.testing.assert_allclose(scores['expected'], prior_mean)
+    assert scores.groupby(['dow', 'hr', 'weathersit']).head(1)['expected'].isna().all()
+
+
+def test_fingerprint_detects_corrected_rows():
+    df = load_hourly()
+    corrected = df.copy()
+    corrected.loc[5, 'cnt'] += 1
+    assert data_fingerprint(df) == data_fingerprint(df.copy())
+    assert data_fingerprint(df) != data_fingerprint(corrected)